@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Artifact bloat report: diff the contents of two releases
+
+Reads the zip central directory and the AppImage's embedded squashfs inode and
+directory tables straight from a memory map, builds a per-path size index
+without extracting anything, and ranks the paths that grew the most between
+an old and a new artifact.
+
+Usage:
+    python3 artifact_bloat_report.py old/Professional-Audio-Mixer-1.0.0-arm64-mac.zip release/Professional-Audio-Mixer-1.0.1-arm64-mac.zip
+    python3 artifact_bloat_report.py previous-release/ release/ --depth 4
+    python3 artifact_bloat_report.py previous-release/ release/ --max-growth-mb 5   # exit 1 if exceeded
+"""
+
+import argparse
+import lzma
+import mmap
+import re
+import struct
+import sys
+import time
+import zlib
+from pathlib import Path
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Errors that mean an artifact could not be indexed
+INDEX_ERRORS = (OSError, ValueError, struct.error, zlib.error, lzma.LZMAError)
+if ZSTD_AVAILABLE:
+    INDEX_ERRORS += (zstandard.ZstdError,)
+
+# Configuration
+TOP_COUNT = 20
+ARTIFACT_PATTERNS = ("*.zip", "*.AppImage")
+# Version in artifact names, including prerelease suffixes such as -beta.1
+VERSION_PATTERN = re.compile(r"-\d+\.\d+\.\d+(?:-(?:alpha|beta|rc|pre|dev|canary|next)(?:\.?\d+)*)?",
+                             re.IGNORECASE)
+
+ZIP_EOCD = struct.Struct("<IHHHHIIH")
+ZIP64_LOCATOR = struct.Struct("<IIQI")
+ZIP64_EOCD = struct.Struct("<IQHHIIQQQQ")
+ZIP_CENTRAL = struct.Struct("<IHHHHHHIIIHHHHHII")
+
+SQUASHFS_SUPERBLOCK = struct.Struct("<IIIIIHHHHHHQQQQQQQQ")
+SQUASHFS_INODE_HEADER = struct.Struct("<HHHHII")
+SQUASHFS_METADATA_SIZE = 8192
+SQUASHFS_NO_FRAGMENT = 0xFFFFFFFF
+
+# Squashfs inode types
+DIR, FILE, SYMLINK, EXT_DIR, EXT_FILE, EXT_SYMLINK = 1, 2, 3, 8, 9, 10
+
+
+def index_artifact(file_path):
+    """Map every file in a zip or AppImage to (size, stored_size) in bytes"""
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if mm[:4] == b"\x7fELF":
+            return index_appimage(mm)
+        return index_zip(mm)
+
+
+def index_zip(mm):
+    """Index a zip from its central directory"""
+    eocd = mm.rfind(b"PK\x05\x06", max(0, len(mm) - 0xFFFF - ZIP_EOCD.size))
+    if eocd < 0:
+        raise ValueError("not a zip file (no end of central directory)")
+    _, _, _, _, count, cd_size, cd_offset, _ = ZIP_EOCD.unpack_from(mm, eocd)
+
+    locator = eocd - ZIP64_LOCATOR.size
+    if locator >= 0 and mm[locator:locator + 4] == b"PK\x06\x07":
+        zip64_offset = ZIP64_LOCATOR.unpack_from(mm, locator)[2]
+        fields = ZIP64_EOCD.unpack_from(mm, zip64_offset)
+        count, cd_size, cd_offset = fields[7], fields[8], fields[9]
+    if cd_offset + cd_size > len(mm):
+        raise ValueError("central directory extends past the end of the file")
+
+    index = {}
+    pos = cd_offset
+    for _ in range(count):
+        (signature, _, _, flags, _, _, _, _, stored, size, name_len, extra_len,
+         comment_len, _, _, _, _) = ZIP_CENTRAL.unpack_from(mm, pos)
+        if signature != 0x02014B50:
+            raise ValueError(f"corrupt central directory at offset {pos}")
+
+        name_start = pos + ZIP_CENTRAL.size
+        name = mm[name_start:name_start + name_len].decode(
+            "utf-8" if flags & 0x800 else "cp437", "replace"
+        )
+        if 0xFFFFFFFF in (size, stored):
+            size, stored = _zip64_sizes(mm, name_start + name_len, extra_len, size, stored)
+        if not name.endswith("/"):
+            index[name] = (size, stored)
+        pos = name_start + name_len + extra_len + comment_len
+    return index
+
+
+def _zip64_sizes(mm, pos, length, size, stored):
+    """Read the real sizes from the zip64 extra field"""
+    end = pos + length
+    while pos + 4 <= end:
+        header_id, data_size = struct.unpack_from("<HH", mm, pos)
+        if header_id == 0x0001:
+            values = iter(struct.unpack_from(f"<{data_size // 8}Q", mm, pos + 4))
+            if size == 0xFFFFFFFF:
+                size = next(values)
+            if stored == 0xFFFFFFFF:
+                stored = next(values)
+            break
+        pos += 4 + data_size
+    return size, stored
+
+
+def _squashfs_offset(mm):
+    """The squashfs image starts right after the ELF runtime's section headers"""
+    if mm[4] == 2:
+        shoff, = struct.unpack_from("<Q", mm, 0x28)
+        shentsize, shnum = struct.unpack_from("<HH", mm, 0x3A)
+    else:
+        shoff, = struct.unpack_from("<I", mm, 0x20)
+        shentsize, shnum = struct.unpack_from("<HH", mm, 0x2E)
+    offset = shoff + shentsize * shnum
+    if mm[offset:offset + 4] != b"hsqs":
+        offset = mm.find(b"hsqs", offset)
+    if offset < 0:
+        raise ValueError("no squashfs image found (type 1 AppImages are not supported)")
+    return offset
+
+
+def _decompressor(compressor):
+    """Return a function that inflates one squashfs metadata block"""
+    if compressor == 1:
+        return zlib.decompress
+    if compressor == 2:
+        return lambda data: lzma.LZMADecompressor(lzma.FORMAT_ALONE).decompress(data)
+    if compressor == 4:
+        return lzma.decompress
+    if compressor == 6:
+        if not ZSTD_AVAILABLE:
+            raise ValueError("zstd squashfs needs the zstandard package: pip install zstandard")
+        decompressor = zstandard.ZstdDecompressor()
+        return lambda data: decompressor.decompress(data, max_output_size=SQUASHFS_METADATA_SIZE)
+    names = {3: "lzo", 5: "lz4"}
+    raise ValueError(f"unsupported squashfs compressor: {names.get(compressor, compressor)}")
+
+
+class _MetadataReader:
+    """Random access to a squashfs metadata table, inflating blocks on demand"""
+
+    def __init__(self, mm, start, decompress):
+        self.mm = mm
+        self.start = start
+        self.decompress = decompress
+        self.blocks = {}
+
+    def _block(self, block):
+        if block not in self.blocks:
+            pos = self.start + block
+            header, = struct.unpack_from("<H", self.mm, pos)
+            length = header & 0x7FFF
+            data = self.mm[pos + 2:pos + 2 + length]
+            if not header & 0x8000:
+                data = self.decompress(data)
+            self.blocks[block] = (data, block + 2 + length)
+        return self.blocks[block]
+
+    def read(self, block, offset, length):
+        """Read length bytes; returns (data, block, offset) of the following byte"""
+        out = bytearray()
+        while length > 0:
+            data, next_block = self._block(block)
+            if offset >= len(data):
+                block, offset = next_block, offset - len(data)
+                continue
+            piece = data[offset:offset + length]
+            out += piece
+            length -= len(piece)
+            offset += len(piece)
+        return bytes(out), block, offset
+
+
+def index_appimage(mm):
+    """Index an AppImage from the inode and directory tables of its squashfs image"""
+    base = _squashfs_offset(mm)
+    (magic, _, _, block_size, _, compressor, _, _, _, major, _, root_inode, _, _, _,
+     inode_table, dir_table, _, _) = SQUASHFS_SUPERBLOCK.unpack_from(mm, base)
+    if magic != 0x73717368 or major != 4:
+        raise ValueError("only squashfs 4.x images are supported")
+
+    decompress = _decompressor(compressor)
+    inodes = _MetadataReader(mm, base + inode_table, decompress)
+    directories = _MetadataReader(mm, base + dir_table, decompress)
+
+    def read_inode(ref):
+        return _read_inode(inodes, ref >> 16, ref & 0xFFFF, block_size)
+
+    index = {}
+    stack = [("", read_inode(root_inode))]
+    while stack:
+        prefix, (_, _, (block, offset, listing_size)) = stack.pop()
+        listing = directories.read(block, offset, listing_size)[0] if listing_size > 0 else b""
+
+        pos = 0
+        while pos < len(listing):
+            count, start, _ = struct.unpack_from("<IIi", listing, pos)
+            pos += 12
+            for _ in range(count + 1):
+                entry_offset, _, _, name_size = struct.unpack_from("<HhHH", listing, pos)
+                name = listing[pos + 8:pos + 9 + name_size].decode("utf-8", "surrogateescape")
+                pos += 9 + name_size
+
+                path = f"{prefix}{name}"
+                inode_type, sizes, directory = read_inode((start << 16) | entry_offset)
+                if inode_type in (DIR, EXT_DIR):
+                    stack.append((f"{path}/", (inode_type, sizes, directory)))
+                elif sizes is not None:
+                    index[path] = sizes
+    return index
+
+
+def _read_inode(reader, block, offset, block_size):
+    """Return (type, (size, stored_size) or None, directory listing location or None)"""
+    header, block, offset = reader.read(block, offset, SQUASHFS_INODE_HEADER.size)
+    inode_type = SQUASHFS_INODE_HEADER.unpack(header)[0]
+
+    if inode_type == DIR:
+        data = reader.read(block, offset, 16)[0]
+        start, _, size, dir_offset, _ = struct.unpack("<IIHHI", data)
+        # Directory sizes include 3 bytes for the implicit . and .. entries
+        return inode_type, None, (start, dir_offset, size - 3)
+    if inode_type == EXT_DIR:
+        data = reader.read(block, offset, 24)[0]
+        _, size, start, _, _, dir_offset, _ = struct.unpack("<IIIIHHI", data)
+        return inode_type, None, (start, dir_offset, size - 3)
+
+    if inode_type in (FILE, EXT_FILE):
+        if inode_type == FILE:
+            data, block, offset = reader.read(block, offset, 16)
+            _, fragment, _, size = struct.unpack("<IIII", data)
+        else:
+            data, block, offset = reader.read(block, offset, 40)
+            _, size, _, _, fragment, _, _ = struct.unpack("<QQQIIII", data)
+        if fragment == SQUASHFS_NO_FRAGMENT:
+            block_count = -(-size // block_size)
+            tail = 0
+        else:
+            block_count = size // block_size
+            tail = size % block_size
+        block_sizes = struct.unpack(f"<{block_count}I", reader.read(block, offset, 4 * block_count)[0])
+        # Fragment tails share a compressed block with other files, so count them uncompressed
+        return inode_type, (size, sum(s & 0x00FFFFFF for s in block_sizes) + tail), None
+
+    if inode_type in (SYMLINK, EXT_SYMLINK):
+        target_size = struct.unpack("<II", reader.read(block, offset, 8)[0])[1]
+        return inode_type, (target_size, target_size), None
+
+    return inode_type, None, None
+
+
+def aggregate(index, depth):
+    """Sum sizes per leading path components (depth 0 keeps individual files)"""
+    if depth <= 0:
+        return index
+    totals = {}
+    for path, (size, stored) in index.items():
+        parts = path.split("/")
+        key = "/".join(parts[:depth]) + ("/" if len(parts) > depth else "")
+        old_size, old_stored = totals.get(key, (0, 0))
+        totals[key] = (old_size + size, old_stored + stored)
+    return totals
+
+
+def diff_indexes(old, new, by_stored=True):
+    """Return (path, old_sizes, new_sizes, delta) sorted by growth, largest first"""
+    column = 1 if by_stored else 0
+    rows = []
+    for path in old.keys() | new.keys():
+        old_sizes = old.get(path, (0, 0))
+        new_sizes = new.get(path, (0, 0))
+        rows.append((path, old_sizes, new_sizes, new_sizes[column] - old_sizes[column]))
+    rows.sort(key=lambda row: (-row[3], row[0]))
+    return rows
+
+
+def pair_artifacts(old_dir, new_dir):
+    """Match artifacts in two release directories by name with the version removed"""
+    def by_key(directory):
+        files = [f for pattern in ARTIFACT_PATTERNS for f in Path(directory).glob(pattern)]
+        return {VERSION_PATTERN.sub("", f.name): f for f in files}
+
+    old_files = by_key(old_dir)
+    new_files = by_key(new_dir)
+    return [(old_files[key], new_files[key]) for key in sorted(old_files.keys() & new_files.keys())]
+
+
+def _mb(size):
+    return size / (1024 * 1024)
+
+
+def report(old_path, new_path, top=TOP_COUNT, depth=0, by_stored=True):
+    """Print the bloat report for one artifact pair; returns the file size growth in bytes"""
+    print(f"\n📦 {old_path.name} -> {new_path.name}")
+
+    started = time.perf_counter()
+    old_index = index_artifact(old_path)
+    old_elapsed = time.perf_counter() - started
+    started = time.perf_counter()
+    new_index = index_artifact(new_path)
+    new_elapsed = time.perf_counter() - started
+    print(f"   ⏱️  Indexed {len(old_index)} files in {old_elapsed:.3f}s, "
+          f"{len(new_index)} files in {new_elapsed:.3f}s")
+
+    growth = new_path.stat().st_size - old_path.stat().st_size
+    print(f"   📊 Artifact: {_mb(old_path.stat().st_size):.1f} MB -> "
+          f"{_mb(new_path.stat().st_size):.1f} MB ({_mb(growth):+.2f} MB)")
+
+    added = len(new_index.keys() - old_index.keys())
+    removed = len(old_index.keys() - new_index.keys())
+    print(f"   📁 {added} files added, {removed} removed")
+
+    rows = [row for row in diff_indexes(aggregate(old_index, depth), aggregate(new_index, depth),
+                                        by_stored) if row[3] > 0]
+    if not rows:
+        print("   ✅ Nothing grew")
+        return growth
+
+    column = 1 if by_stored else 0
+    print(f"   📈 Top growers ({'compressed' if by_stored else 'uncompressed'} size):")
+    for path, old_sizes, new_sizes, delta in rows[:top]:
+        print(f"      {_mb(delta):+9.3f} MB  {path}  "
+              f"({_mb(old_sizes[column]):.2f} -> {_mb(new_sizes[column]):.2f} MB)")
+    return growth
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Diff artifact contents between two releases")
+    parser.add_argument("old", help="old artifact, or a directory of old artifacts")
+    parser.add_argument("new", help="new artifact, or a directory of new artifacts")
+    parser.add_argument("--top", type=int, default=TOP_COUNT, help="number of growers to list")
+    parser.add_argument("--depth", type=int, default=0,
+                        help="group sizes by this many leading path components")
+    parser.add_argument("--uncompressed", action="store_true",
+                        help="rank by uncompressed instead of compressed size")
+    parser.add_argument("--max-growth-mb", type=float,
+                        help="fail if any artifact grew by more than this")
+    args = parser.parse_args()
+
+    print("🔎 Professional Audio Mixer - Artifact Bloat Report")
+    print("=" * 50)
+
+    old_path, new_path = Path(args.old), Path(args.new)
+    if old_path.is_dir() and new_path.is_dir():
+        pairs = pair_artifacts(old_path, new_path)
+    elif old_path.is_file() and new_path.is_file():
+        pairs = [(old_path, new_path)]
+    else:
+        print("❌ Please pass two artifacts or two release directories")
+        return False
+
+    if not pairs:
+        print("❌ No matching artifacts found")
+        return False
+
+    success = True
+    for old_file, new_file in pairs:
+        try:
+            growth = report(old_file, new_file, args.top, args.depth, not args.uncompressed)
+        except INDEX_ERRORS as e:
+            print(f"❌ Could not index {old_file.name} / {new_file.name}: {e}")
+            success = False
+            continue
+        if args.max_growth_mb is not None and _mb(growth) > args.max_growth_mb:
+            print(f"   ❌ Grew by {_mb(growth):.2f} MB, limit is {args.max_growth_mb:.2f} MB")
+            success = False
+    return success
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
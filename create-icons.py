@@ -1,17 +1,35 @@
 #!/usr/bin/env python3
 """
 Create professional audio mixer icons for different platforms
+
+Large marketing/store exports are rendered in horizontal bands that are
+streamed straight into the PNG file, so memory scales with the band size:
+    python3 create-icons.py --export 4096 8192
 """
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import argparse
 import os
+import struct
+import zlib
 
-def create_icon(size=512):
-    """Create a professional audio mixer icon"""
-    # Create image with transparent background
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
+BAND_HEIGHT = 256
+TILE_WORKERS = 2
+# Peak memory for bands being rendered; each one holds about BAND_COPIES copies of its pixels
+MEMORY_BUDGET = 64 * 1024 * 1024
+BAND_COPIES = 4
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+def _shift(coords, top):
+    """Move drawing coordinates up by top rows"""
+    if coords and isinstance(coords[0], tuple):
+        return [(x, y - top) for x, y in coords]
+    return [c - top if i % 2 else c for i, c in enumerate(coords)]
+
+def draw_icon(draw, size, top=0):
+    """Draw the icon onto draw, whose canvas starts at icon row top"""
     # Colors
     bg_color = (26, 26, 26, 255)  # Dark background
     primary_color = (76, 175, 80, 255)  # Green
@@ -20,16 +38,16 @@ def create_icon(size=512):
     
     # Background circle
     margin = size // 16
-    draw.ellipse([margin, margin, size-margin, size-margin], fill=bg_color)
+    draw.ellipse(_shift([margin, margin, size-margin, size-margin], top), fill=bg_color)
     
     # Outer ring
     ring_width = size // 32
-    draw.ellipse([margin*2, margin*2, size-margin*2, size-margin*2], 
+    draw.ellipse(_shift([margin*2, margin*2, size-margin*2, size-margin*2], top), 
                 outline=primary_color, width=ring_width)
     
     # Inner circle
     inner_margin = margin * 3
-    draw.ellipse([inner_margin, inner_margin, size-inner_margin, size-inner_margin], 
+    draw.ellipse(_shift([inner_margin, inner_margin, size-inner_margin, size-inner_margin], top), 
                 fill=secondary_color)
     
     # Mixer faders (5 vertical faders)
@@ -44,26 +62,26 @@ def create_icon(size=512):
         x = start_x + i * fader_spacing
         
         # Fader track
-        draw.rectangle([x - fader_width//2, fader_y, 
-                       x + fader_width//2, fader_y + fader_height], 
+        draw.rectangle(_shift([x - fader_width//2, fader_y, 
+                       x + fader_width//2, fader_y + fader_height], top), 
                       fill=(85, 85, 85, 255))
         
         # Fader handle (at different positions)
         handle_height = size // 32
         handle_y = fader_y + (i * fader_height // fader_count)
-        draw.rectangle([x - fader_width*2, handle_y, 
-                       x + fader_width*2, handle_y + handle_height], 
+        draw.rectangle(_shift([x - fader_width*2, handle_y, 
+                       x + fader_width*2, handle_y + handle_height], top), 
                       fill=primary_color)
         
         # Knob above fader
         knob_y = fader_y - size // 16
         knob_radius = size // 32
-        draw.ellipse([x - knob_radius, knob_y - knob_radius,
-                     x + knob_radius, knob_y + knob_radius], 
+        draw.ellipse(_shift([x - knob_radius, knob_y - knob_radius,
+                     x + knob_radius, knob_y + knob_radius], top), 
                     outline=primary_color, width=size//128)
         
         # Knob indicator
-        draw.line([x, knob_y, x + knob_radius//2, knob_y - knob_radius//2], 
+        draw.line(_shift([x, knob_y, x + knob_radius//2, knob_y - knob_radius//2], top), 
                  fill=white, width=size//256)
     
     # Sound waves at top
@@ -71,16 +89,16 @@ def create_icon(size=512):
     wave_y = size // 4
     for i in range(3):
         radius = size // 16 + i * size // 32
-        draw.arc([wave_center_x - radius, wave_y - radius//2,
-                 wave_center_x + radius, wave_y + radius//2], 
+        draw.arc(_shift([wave_center_x - radius, wave_y - radius//2,
+                 wave_center_x + radius, wave_y + radius//2], top), 
                 0, 180, fill=primary_color, width=size//128)
     
     # Sound waves at bottom
     wave_y = size * 3 // 4
     for i in range(3):
         radius = size // 16 + i * size // 32
-        draw.arc([wave_center_x - radius, wave_y - radius//2,
-                 wave_center_x + radius, wave_y + radius//2], 
+        draw.arc(_shift([wave_center_x - radius, wave_y - radius//2,
+                 wave_center_x + radius, wave_y + radius//2], top), 
                 180, 360, fill=primary_color, width=size//128)
     
     # Center musical note
@@ -89,15 +107,15 @@ def create_icon(size=512):
     note_radius = size // 20
     
     # Note head
-    draw.ellipse([note_x - note_radius, note_y - note_radius,
-                 note_x + note_radius, note_y + note_radius], 
+    draw.ellipse(_shift([note_x - note_radius, note_y - note_radius,
+                 note_x + note_radius, note_y + note_radius], top), 
                 fill=primary_color)
     
     # Note stem
     stem_width = size // 128
     stem_height = size // 8
-    draw.rectangle([note_x + note_radius//2, note_y - stem_height,
-                   note_x + note_radius//2 + stem_width, note_y], 
+    draw.rectangle(_shift([note_x + note_radius//2, note_y - stem_height,
+                   note_x + note_radius//2 + stem_width, note_y], top), 
                   fill=white)
     
     # Note flag
@@ -106,15 +124,106 @@ def create_icon(size=512):
         (note_x + note_radius, note_y - stem_height + size//32),
         (note_x + note_radius//2 + stem_width, note_y - stem_height + size//16)
     ]
-    draw.polygon(flag_points, fill=white)
-    
+    draw.polygon(_shift(flag_points, top), fill=white)
+
+def create_icon(size=512):
+    """Create a professional audio mixer icon"""
+    # Create image with transparent background
+    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    draw_icon(draw, size)
     return img
 
+def _render_band(size, top, height, level, last):
+    """Render one band and deflate its PNG scanlines; returns (data, adler32, length)"""
+    # Draw one extra row on top: the Up filter needs the row above the band
+    # (above the first band that row is empty, as PNG expects)
+    band = Image.new('RGBA', (size, height + 1), (0, 0, 0, 0))
+    draw_icon(ImageDraw.Draw(band), size, top - 1)
+    filtered = ImageChops.subtract_modulo(band.crop((0, 1, size, height + 1)),
+                                          band.crop((0, 0, size, height)))
+    del band
+    pixels = memoryview(filtered.tobytes())
+    del filtered
+    
+    # Filter type 2 (Up) in front of every scanline
+    stride = size * 4
+    scanlines = bytearray(height * (stride + 1))
+    view = memoryview(scanlines)
+    for row in range(height):
+        start = row * (stride + 1)
+        view[start] = 2
+        view[start + 1:start + 1 + stride] = pixels[row * stride:(row + 1) * stride]
+    del pixels
+    
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    data = compressor.compress(scanlines) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+    return data, zlib.adler32(scanlines), len(scanlines)
+
+def _adler32_combine(adler1, adler2, length2):
+    """Adler-32 of two concatenated buffers from their separate checksums"""
+    base = 65521
+    a1, b1 = adler1 & 0xFFFF, adler1 >> 16
+    a2, b2 = adler2 & 0xFFFF, adler2 >> 16
+    a = (a1 + a2 - 1) % base
+    b = (b1 + b2 + (length2 % base) * (a1 - 1)) % base
+    return (b << 16) | a
+
+def _png_chunk(chunk_type, data):
+    return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data))
+
+def create_icon_tiled(size, filename, band_height=BAND_HEIGHT, workers=TILE_WORKERS,
+                      level=6, memory_budget=MEMORY_BUDGET):
+    """Render the icon band by band straight into a PNG file
+    
+    Each band is drawn, Up-filtered and compressed on a worker and written as
+    an IDAT chunk in order; the bands are sync-flushed so they join into one
+    zlib stream. Drawing and filtering run inside Pillow under the GIL, but
+    zlib releases it, so extra workers overlap one band's compression with
+    drawing the next rather than splitting a band across cores. The band
+    height and the number of bands rendered at once are capped so their
+    pixels fit in memory_budget, whatever the image size.
+    """
+    row_bytes = size * 4 * BAND_COPIES
+    band_height = max(1, min(band_height, memory_budget // row_bytes))
+    workers = max(1, min(workers, memory_budget // (row_bytes * band_height)))
+    bands = [(top, min(band_height, size - top)) for top in range(0, size, band_height)]
+    
+    with open(filename, 'wb') as f, ThreadPoolExecutor(max_workers=workers) as executor:
+        f.write(PNG_SIGNATURE)
+        f.write(_png_chunk(b'IHDR', struct.pack('>IIBBBBB', size, size, 8, 6, 0, 0, 0)))
+        f.write(_png_chunk(b'IDAT', b'\x78\x9c'))
+        
+        adler = 1
+        pending = deque()
+        for index, (top, height) in enumerate(bands):
+            last = index == len(bands) - 1
+            pending.append(executor.submit(_render_band, size, top, height, level, last))
+            while pending and (len(pending) >= workers * 2 or last):
+                data, band_adler, length = pending.popleft().result()
+                adler = _adler32_combine(adler, band_adler, length)
+                f.write(_png_chunk(b'IDAT', data))
+
+        f.write(_png_chunk(b'IDAT', struct.pack('>I', adler)))
+        f.write(_png_chunk(b'IEND', b''))
+
 def main():
     """Create icons for different platforms"""
+    parser = argparse.ArgumentParser(description="Create the app icons")
+    parser.add_argument('--export', type=int, nargs='+', metavar='SIZE',
+                        help="only render these large sizes with the tiled renderer")
+    parser.add_argument('--band-height', type=int, default=BAND_HEIGHT)
+    args = parser.parse_args()
+    
     # Create assets directory
     os.makedirs('assets', exist_ok=True)
     
+    if args.export:
+        for size in args.export:
+            create_icon_tiled(size, f'assets/icon-{size}.png', args.band_height)
+            print(f"Created: assets/icon-{size}.png")
+        return
+    
     # Create base icon
     base_icon = create_icon(512)
     
@@ -137,9 +246,9 @@ def main():
     for filename, size in sizes.items():
         if size <= 512:
             resized = base_icon.resize((size, size), Image.Resampling.LANCZOS)
+            resized.save(f'assets/{filename}', 'PNG')
         else:
-            resized = create_icon(size)
-        resized.save(f'assets/{filename}', 'PNG')
+            create_icon_tiled(size, f'assets/{filename}', args.band_height)
         print(f"Created: assets/{filename}")
     
     print("\nIcon files created successfully!")
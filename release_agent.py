@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Watch-mode release agent
+
+Runs next to `npm run dist:*` and prepares artifacts while the build is
+still going. It watches release/ (inotify on Linux, polling elsewhere) and
+waits until each artifact is closed and its size and mtime have stopped
+changing. Then it hashes the file (SHA-256 and SHA-512 in one read) and
+checks its zip central directory or AppImage squashfs tables. The results go
+to release/.release-manifest.json, which release_pipeline.py reads instead
+of hashing again.
+
+Hashing waits for the file to be complete because electron-builder's tools
+patch earlier bytes in place (mksquashfs writes its superblock at offset 0
+last), so a hash of the bytes appended so far can't be trusted. The file is
+still in the page cache at that point, so the read is cheap.
+
+It also re-renders the icons with create-icons.py when the icon sources
+change, and checks the dimensions of every PNG in assets/.
+
+Usage:
+    python3 release_agent.py            # watch until Ctrl+C
+    python3 release_agent.py --once     # prepare what is in release/ now and exit
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import os
+import select
+import struct
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from artifact_bloat_report import index_artifact
+
+# Configuration
+RELEASE_DIR = "release"
+ASSETS_DIR = "assets"
+MANIFEST_NAME = ".release-manifest.json"
+ARTIFACT_SUFFIXES = (".zip", ".AppImage", ".dmg", ".exe", ".deb")
+VALIDATED_SUFFIXES = (".zip", ".AppImage")
+ICON_SCRIPT = "create-icons.py"
+ICON_SOURCES = {ICON_SCRIPT, "icon.svg"}
+ICON_SIZES = {"icon.png": 512, **{f"icon-{size}.png": size for size in (16, 32, 48, 64, 128, 256, 512, 1024)}}
+
+SETTLE_SECONDS = 2.0
+POLL_INTERVAL = 0.5
+CHUNK_SIZE = 1024 * 1024
+WORKERS = 2
+
+# inotify event masks
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class _InotifyWatcher:
+    """Directory events from the Linux inotify API"""
+
+    def __init__(self, directories):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.directories = {}
+        for directory in directories:
+            wd = libc.inotify_add_watch(self.fd, str(directory).encode(), WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"cannot watch {directory}")
+            self.directories[wd] = Path(directory)
+
+    def wait(self, timeout):
+        """Return (directory, name, mask) events, waiting at most timeout seconds"""
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return []
+        buffer = os.read(self.fd, 64 * 1024)
+        events = []
+        pos = 0
+        while pos < len(buffer):
+            wd, mask, _, length = INOTIFY_EVENT.unpack_from(buffer, pos)
+            name = buffer[pos + INOTIFY_EVENT.size:pos + INOTIFY_EVENT.size + length]
+            pos += INOTIFY_EVENT.size + length
+            if wd in self.directories:
+                events.append((self.directories[wd], os.fsdecode(name.rstrip(b"\0")), mask))
+        return events
+
+
+class _PollingWatcher:
+    """Directory events from comparing stat results, for systems without inotify"""
+
+    def __init__(self, directories):
+        self.directories = [Path(directory) for directory in directories]
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        for directory in self.directories:
+            for entry in os.scandir(directory):
+                if entry.is_file():
+                    stat = entry.stat()
+                    snapshot[(directory, entry.name)] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def wait(self, timeout):
+        """Return (directory, name, mask) events after sleeping for timeout seconds"""
+        time.sleep(timeout)
+        snapshot = self._scan()
+        events = [(directory, name, IN_MODIFY)
+                  for (directory, name), stat in snapshot.items()
+                  if self.snapshot.get((directory, name)) != stat]
+        events += [(directory, name, IN_DELETE)
+                   for directory, name in self.snapshot.keys() - snapshot.keys()]
+        self.snapshot = snapshot
+        return events
+
+
+def make_watcher(directories):
+    """Use inotify where available and fall back to polling"""
+    if sys.platform.startswith("linux"):
+        try:
+            return _InotifyWatcher(directories), True
+        except (OSError, AttributeError) as e:
+            print(f"⚠️  inotify unavailable ({e}), falling back to polling")
+    return _PollingWatcher(directories), False
+
+
+def load_manifest(release_dir=RELEASE_DIR):
+    """Load the prepared-artifact manifest, or an empty one"""
+    try:
+        with open(Path(release_dir) / MANIFEST_NAME) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    manifest.setdefault("artifacts", {})
+    manifest.setdefault("icons", {})
+    return manifest
+
+
+def save_manifest(manifest, release_dir=RELEASE_DIR):
+    """Write the manifest atomically so readers never see a partial file"""
+    path = Path(release_dir) / MANIFEST_NAME
+    tmp_path = path.with_name(f"{MANIFEST_NAME}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def lookup_manifest(name, size, mtime_ns, release_dir=RELEASE_DIR):
+    """Return the prepared entry for an artifact if it still matches the file on disk"""
+    entry = load_manifest(release_dir)["artifacts"].get(name)
+    if entry and entry["size"] == size and entry["mtime_ns"] == mtime_ns:
+        return entry
+    return None
+
+
+def is_artifact(name):
+    return name.endswith(ARTIFACT_SUFFIXES) and not name.startswith(".")
+
+
+def prepare_artifact(file_path):
+    """Hash and validate a finished artifact; returns None if it changed meanwhile"""
+    stat = file_path.stat()
+    sha256 = hashlib.sha256()
+    sha512 = hashlib.sha512()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            sha256.update(chunk)
+            sha512.update(chunk)
+
+    entry = {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": sha256.hexdigest(),
+        "sha512": sha512.hexdigest(),
+        "valid": True,
+        "error": None,
+        "files": None,
+        "prepared_at": datetime.now(timezone.utc).isoformat()
+    }
+    if file_path.name.endswith(VALIDATED_SUFFIXES):
+        try:
+            entry["files"] = len(index_artifact(file_path))
+            if not entry["files"]:
+                raise ValueError("archive is empty")
+        except Exception as e:
+            entry["valid"] = False
+            entry["error"] = str(e)
+
+    after = file_path.stat()
+    if (after.st_size, after.st_mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+        return None
+    return entry
+
+
+def _png_size(file_path):
+    """Width and height from a PNG's IHDR chunk"""
+    with open(file_path, "rb") as f:
+        header = f.read(24)
+    if header[:8] != b"\x89PNG\r\n\x1a\n" or header[12:16] != b"IHDR":
+        raise ValueError("not a PNG file")
+    return struct.unpack(">II", header[16:24])
+
+
+def check_icons(assets_dir=ASSETS_DIR):
+    """Return a list of problems with the rendered icon PNGs"""
+    problems = []
+    for name, size in sorted(ICON_SIZES.items()):
+        path = Path(assets_dir) / name
+        try:
+            if _png_size(path) != (size, size):
+                problems.append(f"{name} is {'x'.join(map(str, _png_size(path)))}, expected {size}x{size}")
+        except (OSError, ValueError) as e:
+            problems.append(f"{name}: {e}")
+    return problems
+
+
+def render_icons():
+    """Re-render the icons with create-icons.py and check the results"""
+    result = subprocess.run([sys.executable, ICON_SCRIPT], capture_output=True, text=True)
+    problems = [] if result.returncode == 0 else [f"{ICON_SCRIPT} failed: {result.stderr.strip()}"]
+    return {
+        "rendered": result.returncode == 0,
+        "problems": problems + check_icons(),
+        "checked_at": datetime.now(timezone.utc).isoformat()
+    }
+
+
+class ReleaseAgent:
+    """Track artifacts until they settle and prepare them in the background"""
+
+    def __init__(self, release_dir=RELEASE_DIR, settle=SETTLE_SECONDS, workers=WORKERS):
+        self.release_dir = Path(release_dir)
+        self.settle = settle
+        self.manifest = load_manifest(release_dir)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.pending = {}
+        self.jobs = {}
+        self.icons_changed = None
+        self.icon_job = None
+        self.closed_events = False
+
+    def scan(self):
+        """Queue artifacts already in release/ that are not prepared yet"""
+        for entry in os.scandir(self.release_dir):
+            if not entry.is_file() or not is_artifact(entry.name):
+                continue
+            stat = entry.stat()
+            if not lookup_manifest(entry.name, stat.st_size, stat.st_mtime_ns, self.release_dir):
+                self._touch(entry.name, closed=True)
+        for name in list(self.manifest["artifacts"]):
+            if not (self.release_dir / name).exists():
+                del self.manifest["artifacts"][name]
+
+    def handle(self, directory, name, mask):
+        """Record one watcher event"""
+        if directory == self.release_dir and is_artifact(name):
+            if mask & (IN_DELETE | IN_MOVED_FROM):
+                self.pending.pop(name, None)
+                if self.manifest["artifacts"].pop(name, None) is not None:
+                    save_manifest(self.manifest, self.release_dir)
+                    print(f"🗑️  Removed: {name}")
+            else:
+                # Files that appear via rename are complete; writes leave them open
+                closed = bool(mask & (IN_CLOSE_WRITE | IN_MOVED_TO)) or not self.closed_events
+                self._touch(name, closed)
+        elif name in ICON_SOURCES and directory != self.release_dir:
+            self.icons_changed = time.monotonic()
+
+    def _touch(self, name, closed):
+        state = self.pending.setdefault(name, {"stat": None, "changed": time.monotonic()})
+        state["closed"] = closed
+        state["changed"] = time.monotonic()
+        self.manifest["artifacts"].pop(name, None)
+
+    def tick(self):
+        """Start work for everything that has settled and collect finished jobs"""
+        now = time.monotonic()
+        for name, state in list(self.pending.items()):
+            if name in self.jobs:
+                continue
+            path = self.release_dir / name
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                del self.pending[name]
+                continue
+            current = (stat.st_size, stat.st_mtime_ns)
+            if current != state["stat"]:
+                state["stat"] = current
+                state["changed"] = now
+            elif state["closed"] and now - state["changed"] >= self.settle:
+                del self.pending[name]
+                print(f"🔢 Preparing: {name} ({stat.st_size / (1024 * 1024):.1f} MB)")
+                self.jobs[name] = self.executor.submit(prepare_artifact, path)
+
+        if self.icons_changed and self.icon_job is None and now - self.icons_changed >= self.settle:
+            self.icons_changed = None
+            print("🎨 Icon sources changed, re-rendering icons...")
+            self.icon_job = self.executor.submit(render_icons)
+
+        self._collect()
+
+    def _collect(self):
+        changed = False
+        for name, job in list(self.jobs.items()):
+            if not job.done():
+                continue
+            del self.jobs[name]
+            try:
+                entry = job.result()
+            except OSError as e:
+                print(f"❌ Could not prepare {name}: {e}")
+                continue
+            if entry is None or name in self.pending:
+                # Written to again while hashing, prepare it once it settles
+                self._touch(name, closed=self.pending.get(name, {}).get("closed", True))
+                continue
+            self.manifest["artifacts"][name] = entry
+            changed = True
+            if entry["valid"]:
+                print(f"✅ Ready: {name} ({entry['files'] or 0} files, sha256 {entry['sha256'][:12]}…)")
+            else:
+                print(f"❌ Invalid: {name}: {entry['error']}")
+
+        if self.icon_job is not None and self.icon_job.done():
+            self.manifest["icons"] = self.icon_job.result()
+            self.icon_job = None
+            changed = True
+            problems = self.manifest["icons"]["problems"]
+            if problems:
+                for problem in problems:
+                    print(f"❌ Icon: {problem}")
+            else:
+                print("✅ Icons rendered and checked")
+
+        if changed:
+            save_manifest(self.manifest, self.release_dir)
+
+    def busy(self):
+        return bool(self.pending or self.jobs or self.icon_job or self.icons_changed)
+
+    def run(self, once=False):
+        """Watch until interrupted, or until everything present is prepared if once"""
+        watcher, self.closed_events = make_watcher([self.release_dir, Path(ASSETS_DIR), Path(".")])
+        print(f"👀 Watching {self.release_dir}/ and icon sources "
+              f"({'inotify' if self.closed_events else 'polling'})")
+        self.scan()
+        self.manifest["icons"].update({"problems": check_icons()})
+        save_manifest(self.manifest, self.release_dir)
+
+        try:
+            while True:
+                for directory, name, mask in watcher.wait(POLL_INTERVAL):
+                    self.handle(directory, name, mask)
+                self.tick()
+                if once and not self.busy():
+                    return True
+        except KeyboardInterrupt:
+            print("\n👋 Stopping release agent")
+            return True
+        finally:
+            self.executor.shutdown(wait=True)
+            self._collect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prepare release artifacts as they are built")
+    parser.add_argument("--once", action="store_true",
+                        help="prepare the artifacts present now and exit")
+    parser.add_argument("--settle", type=float, default=SETTLE_SECONDS,
+                        help="seconds a file must stay unchanged before it is prepared")
+    args = parser.parse_args()
+
+    print("🤖 Professional Audio Mixer - Release Agent")
+    print("=" * 50)
+
+    if not os.path.exists("package.json"):
+        print("❌ Please run this script from the project root directory")
+        return False
+
+    os.makedirs(RELEASE_DIR, exist_ok=True)
+    agent = ReleaseAgent(settle=args.settle)
+    agent.run(once=args.once)
+    return all(entry["valid"] for entry in agent.manifest["artifacts"].values())
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
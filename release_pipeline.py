@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""
+Pipelined upload of release assets to GitHub
+
+Each artifact has preflight, digest, upload and verify stages. The stages
+form a dependency graph that runs on two bounded worker pools: one for disk
+work (checking and hashing files) and one for network work (release metadata,
+uploads, verification). Uploads start as soon as preflight passes and only
+verification waits for the SHA-256, so hashing overlaps the network work.
+Digests already prepared by release_agent.py are reused instead of re-hashing.
+Once every artifact of a platform is verified, its electron-updater feed
+(latest-mac.yml / latest-linux.yml) is published to the same release.
+
+Usage:
+    python3 release_pipeline.py                     # v<package.json version>, mac + linux
+    python3 release_pipeline.py v1.0.0:mac v1.0.1:mac,linux
+    python3 release_pipeline.py --dry-run           # preflight and digest only
+    python3 release_pipeline.py --repack            # repack mac zips before hashing
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+from release_agent import lookup_manifest
+from repack_mac_zips import repack_file
+from update_feed import FEED_NAMES, HashingReader, build_feed, release_date
+
+# Configuration
+REPO_OWNER = "glitchlabs-eng"
+REPO_NAME = "multichannel-audio-mixer"
+RELEASE_DIR = "release"
+
+DISK_WORKERS = 2
+NETWORK_WORKERS = 3
+CHUNK_SIZE = 1024 * 1024
+# Assets are uploaded under name + UPLOAD_SUFFIX and renamed once complete
+UPLOAD_SUFFIX = ".uploading"
+
+# Artifact names per platform, matching the electron-builder config in package.json
+PLATFORM_FILES = {
+    "mac": [
+        "Professional-Audio-Mixer-{version}-x64-mac.zip",
+        "Professional-Audio-Mixer-{version}-arm64-mac.zip"
+    ],
+    "linux": [
+        "Professional-Audio-Mixer-{version}.AppImage"
+    ]
+}
+
+_local = threading.local()
+
+
+class Task:
+    """A single stage of the pipeline and the tasks it waits on"""
+
+    def __init__(self, name, pool, func, deps):
+        self.name = name
+        self.pool = pool
+        self.func = func
+        self.deps = list(deps)
+        self.dependents = []
+        self.pending = len(self.deps)
+        self.result = None
+        self.error = None
+        self.elapsed = 0.0
+
+
+class PipelineScheduler:
+    """Run a task graph on separate bounded disk and network worker pools"""
+
+    def __init__(self, disk_workers=DISK_WORKERS, network_workers=NETWORK_WORKERS):
+        self.workers = {"disk": disk_workers, "network": network_workers}
+        self.tasks = {}
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+        self._remaining = 0
+        self._pools = {}
+
+    def add(self, name, pool, func, deps=()):
+        """Add a task; func is called with the results of deps, in order"""
+        if name in self.tasks:
+            raise ValueError(f"Duplicate task: {name}")
+        if pool not in self.workers:
+            raise ValueError(f"Unknown pool: {pool}")
+        task = Task(name, pool, func, [self.tasks[dep] for dep in deps])
+        for dep in task.deps:
+            dep.dependents.append(task)
+        self.tasks[name] = task
+        return task
+
+    def get_or_add(self, name, pool, func, deps=()):
+        """Return the task called name, adding it first if needed
+
+        For stages that several releases share. An existing task must have
+        the same pool and dependencies, otherwise it is a naming collision.
+        """
+        task = self.tasks.get(name)
+        if task is None:
+            return self.add(name, pool, func, deps)
+        if task.pool != pool or [dep.name for dep in task.deps] != list(deps):
+            raise ValueError(f"Task {name} already exists with different dependencies")
+        return task
+
+    def run(self):
+        """Execute every task and return True if none of them failed"""
+        self._remaining = len(self.tasks)
+        if not self._remaining:
+            return True
+
+        self._pools = {
+            pool: ThreadPoolExecutor(max_workers=count, thread_name_prefix=pool)
+            for pool, count in self.workers.items()
+        }
+        try:
+            with self._lock:
+                ready = [task for task in self.tasks.values() if not task.deps]
+            for task in ready:
+                self._submit(task)
+            self._finished.wait()
+        finally:
+            for executor in self._pools.values():
+                executor.shutdown(wait=True)
+
+        return all(task.error is None for task in self.tasks.values())
+
+    def busy_time(self, pool):
+        """Total time spent in tasks of one pool"""
+        return sum(task.elapsed for task in self.tasks.values() if task.pool == pool)
+
+    def _submit(self, task):
+        self._pools[task.pool].submit(self._execute, task)
+
+    def _execute(self, task):
+        started = time.perf_counter()
+        try:
+            task.result = task.func(*[dep.result for dep in task.deps])
+        except Exception as e:
+            task.error = e
+            print(f"❌ {task.name}: {e}")
+        task.elapsed = time.perf_counter() - started
+        self._complete(task)
+
+    def _complete(self, task):
+        ready = []
+        skipped = []
+        with self._lock:
+            self._remaining -= 1
+            for dependent in task.dependents:
+                if task.error is not None and dependent.error is None:
+                    dependent.error = RuntimeError(f"skipped, {task.name} failed")
+                dependent.pending -= 1
+                if dependent.pending == 0:
+                    (skipped if dependent.error is not None else ready).append(dependent)
+            if self._remaining == 0:
+                self._finished.set()
+
+        for dependent in ready:
+            self._submit(dependent)
+        for dependent in skipped:
+            self._complete(dependent)
+
+
+def get_github_token():
+    """Get GitHub token from environment or return None"""
+    return os.environ.get('GITHUB_TOKEN') or os.environ.get('GH_TOKEN')
+
+
+def get_package_version():
+    """Read the app version from package.json"""
+    with open("package.json") as f:
+        return json.load(f)["version"]
+
+
+def parse_release_spec(spec, default_platforms):
+    """Split a TAG[:platform,platform] argument into (tag, version, platforms)"""
+    tag, _, platforms = spec.partition(":")
+    platforms = platforms.split(",") if platforms else list(default_platforms)
+    for platform in platforms:
+        if platform not in PLATFORM_FILES:
+            raise ValueError(f"Unknown platform '{platform}' in {spec}")
+    return tag, tag.lstrip("v"), platforms
+
+
+def _session(token):
+    """One requests session per worker thread"""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update({
+            "Authorization": f"token {token}",
+            "Accept": "application/vnd.github.v3+json"
+        })
+        _local.session = session
+    return session
+
+
+def preflight(file_path):
+    """Check that the artifact exists, is not empty and was not rejected by the release agent"""
+    if not file_path.exists():
+        raise FileNotFoundError(f"Missing: {file_path}")
+    stat = file_path.stat()
+    if stat.st_size == 0:
+        raise RuntimeError(f"Empty file: {file_path}")
+    # Only a manifest lookup, so uploads still start before the file is hashed
+    prepared = lookup_manifest(file_path.name, stat.st_size, stat.st_mtime_ns, RELEASE_DIR)
+    if prepared and not prepared["valid"]:
+        raise RuntimeError(f"Invalid artifact {file_path.name}: {prepared['error']}")
+    print(f"✅ Found: {file_path.name} ({stat.st_size / (1024 * 1024):.1f} MB)")
+    return {
+        "path": file_path,
+        "name": file_path.name,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns
+    }
+
+
+def repack(file_path):
+    """Deterministically recompress a mac zip in place before it is hashed"""
+    before, after, elapsed = repack_file(file_path)
+    print(f"🗜️  Repacked: {file_path.name} "
+          f"({(after - before) / (1024 * 1024):+.1f} MB in {elapsed:.1f}s)")
+
+
+def digest(artifact):
+    """SHA-256 of the artifact, from the release agent's manifest or a single streaming read"""
+    prepared = lookup_manifest(artifact["name"], artifact["size"], artifact["mtime_ns"], RELEASE_DIR)
+    if prepared and prepared["valid"]:
+        print(f"♻️  Prepared digest: {artifact['name']}")
+        return dict(artifact, sha256=prepared["sha256"], sha512=prepared["sha512"])
+
+    sha256 = hashlib.sha256()
+    with open(artifact["path"], "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            sha256.update(chunk)
+    print(f"🔢 Hashed: {artifact['name']}")
+    return dict(artifact, sha256=sha256.hexdigest())
+
+
+def get_release_info(token, tag):
+    """Get release information for a tag"""
+    url = f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/releases/tags/{tag}"
+    response = _session(token).get(url)
+    if response.status_code != 200:
+        raise RuntimeError(f"Failed to get release info for {tag}: {response.status_code}")
+    release_info = response.json()
+    print(f"✅ Found release: {release_info['name']} (ID: {release_info['id']})")
+    return release_info
+
+
+def _post_asset(token, release_info, name, body, size, content_type):
+    """Upload body under a temporary name, then swap it in for any existing asset called name
+
+    The old asset stays downloadable until the new one is fully uploaded, so
+    a failed upload loses nothing. GitHub cannot replace an asset in one
+    call: between deleting the old asset and renaming the new one, name
+    briefly returns 404.
+    """
+    session = _session(token)
+    temp_name = f"{name}{UPLOAD_SUFFIX}"
+    existing = {asset["name"]: asset for asset in release_info.get("assets", [])}
+
+    # A leftover from an interrupted run would block the temporary name
+    if temp_name in existing:
+        session.delete(existing[temp_name]["url"])
+
+    upload_url = release_info["upload_url"].split("{")[0]
+    response = session.post(
+        upload_url,
+        params={"name": temp_name},
+        headers={
+            "Content-Type": content_type,
+            "Content-Length": str(size)
+        },
+        data=body
+    )
+    if response.status_code != 201:
+        raise RuntimeError(f"Failed to upload {name}: {response.status_code} {response.text}")
+    asset = response.json()
+
+    if name in existing:
+        print(f"🗑️  Replacing existing asset: {name}")
+        response = session.delete(existing[name]["url"])
+        if response.status_code != 204:
+            raise RuntimeError(
+                f"Could not delete existing asset {name}: {response.status_code} "
+                f"(new upload kept as {temp_name})"
+            )
+
+    response = session.patch(asset["url"], json={"name": name})
+    if response.status_code != 200:
+        replaced = " after deleting the old asset" if name in existing else ""
+        raise RuntimeError(
+            f"Failed to rename {temp_name} to {name}{replaced}: {response.status_code} "
+            f"(re-run the pipeline to restore {name})"
+        )
+    return response.json()
+
+
+def upload_asset(token, artifact, release_info):
+    """Upload the artifact, taking its SHA-512 from the upload stream"""
+    name = artifact["name"]
+    content_type = "application/zip" if name.endswith(".zip") else "application/octet-stream"
+    sha512 = hashlib.sha512()
+
+    print(f"📤 Uploading {name}...")
+    with open(artifact["path"], "rb") as f:
+        body = HashingReader(f, artifact["size"], sha512)
+        asset = _post_asset(token, release_info, name, body, artifact["size"], content_type)
+
+    print(f"✅ Successfully uploaded: {name}")
+    return dict(artifact, asset=asset, sha512=sha512.hexdigest())
+
+
+def verify_asset(token, uploaded, digested):
+    """Check that GitHub stored the asset with the expected size and digest"""
+    artifact = dict(uploaded, sha256=digested["sha256"])
+    if digested.get("sha512") and digested["sha512"] != uploaded["sha512"]:
+        raise RuntimeError(f"{artifact['name']} changed between hashing and upload")
+
+    response = _session(token).get(artifact["asset"]["url"])
+    if response.status_code != 200:
+        raise RuntimeError(f"Failed to fetch asset {artifact['name']}: {response.status_code}")
+    remote = response.json()
+
+    if remote.get("state") != "uploaded":
+        raise RuntimeError(f"Asset {artifact['name']} is in state '{remote.get('state')}'")
+    if remote.get("size") != artifact["size"]:
+        raise RuntimeError(
+            f"Size mismatch for {artifact['name']}: {remote.get('size')} != {artifact['size']}"
+        )
+    remote_digest = remote.get("digest")
+    if remote_digest and remote_digest != f"sha256:{artifact['sha256']}":
+        raise RuntimeError(f"Digest mismatch for {artifact['name']}: {remote_digest}")
+
+    print(f"🔍 Verified: {artifact['name']}")
+    return dict(artifact, download_url=remote["browser_download_url"])
+
+
+def publish_feed(token, version, platform, release_info, artifacts):
+    """Upload the electron-updater feed for a platform next to the artifacts
+
+    The feed is only kept on the release: several tags can publish the same
+    feed name concurrently, so a shared local copy would be last-writer-wins.
+    update_feed.py prints it locally from the manifest.
+    """
+    name = FEED_NAMES[platform]
+    feed = build_feed(version, artifacts, release_date(release_info.get("published_at"))).encode()
+    asset = _post_asset(token, release_info, name, feed, len(feed), "text/yaml")
+    print(f"📰 Published update feed: {name} ({len(feed)} bytes)")
+    return asset["browser_download_url"]
+
+
+def merge_releases(releases):
+    """Combine specs that name the same tag, keeping the platform order"""
+    merged = {}
+    for tag, version, platforms in releases:
+        _, _, known = merged.setdefault(tag, (tag, version, []))
+        known += [platform for platform in platforms if platform not in known]
+    return list(merged.values())
+
+
+def build_pipeline(scheduler, releases, token, dry_run=False, repack_zips=False):
+    """Add the stages for every (tag, version, platforms) release to the scheduler
+
+    File stages (repack, preflight, digest) are named after the file path and
+    shared by every release that ships the file. Release stages (upload,
+    verify, feed) are named after the tag and must be unique.
+    """
+    verify_tasks = []
+    feed_tasks = []
+    for tag, version, platforms in releases:
+        release_task = None
+        if not dry_run:
+            release_task = scheduler.add(
+                f"release {tag}", "network", lambda tag=tag: get_release_info(token, tag)
+            )
+
+        for platform in platforms:
+            platform_verify = []
+            for pattern in PLATFORM_FILES[platform]:
+                name = pattern.format(version=version)
+                file_path = Path(RELEASE_DIR) / name
+
+                preflight_deps = []
+                if repack_zips and name.endswith("-mac.zip"):
+                    preflight_deps.append(scheduler.get_or_add(
+                        f"repack {file_path}", "disk", lambda p=file_path: repack(p)
+                    ).name)
+                preflight_task = scheduler.get_or_add(
+                    f"preflight {file_path}", "disk",
+                    lambda *_, p=file_path: preflight(p), preflight_deps
+                )
+                digest_task = scheduler.get_or_add(
+                    f"digest {file_path}", "disk", digest, [preflight_task.name]
+                )
+                if dry_run:
+                    continue
+
+                upload_task = scheduler.add(
+                    f"upload {tag}/{name}", "network",
+                    lambda artifact, release: upload_asset(token, artifact, release),
+                    [preflight_task.name, release_task.name]
+                )
+                platform_verify.append(scheduler.add(
+                    f"verify {tag}/{name}", "network",
+                    lambda uploaded, digested: verify_asset(token, uploaded, digested),
+                    [upload_task.name, digest_task.name]
+                ))
+
+            if not dry_run:
+                feed_tasks.append(scheduler.add(
+                    f"feed {tag}/{platform}", "network",
+                    lambda release, *artifacts, version=version, platform=platform:
+                        publish_feed(token, version, platform, release, artifacts),
+                    [release_task.name] + [task.name for task in platform_verify]
+                ))
+            verify_tasks += platform_verify
+    return verify_tasks, feed_tasks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipelined GitHub release upload")
+    parser.add_argument("releases", nargs="*", metavar="TAG[:PLATFORMS]",
+                        help="release tag with optional comma-separated platforms (mac, linux)")
+    parser.add_argument("--platforms", default="mac,linux",
+                        help="platforms used when a tag does not list its own")
+    parser.add_argument("--disk-workers", type=int, default=DISK_WORKERS)
+    parser.add_argument("--network-workers", type=int, default=NETWORK_WORKERS)
+    parser.add_argument("--dry-run", action="store_true",
+                        help="only run the preflight and digest stages")
+    parser.add_argument("--repack", action="store_true",
+                        help="deterministically recompress the mac zips before hashing")
+    args = parser.parse_args()
+
+    print("🚀 Professional Audio Mixer - Pipelined Release Upload")
+    print("=" * 50)
+
+    if not os.path.exists("package.json"):
+        print("❌ Please run this script from the project root directory")
+        return False
+
+    specs = args.releases or [f"v{get_package_version()}"]
+    try:
+        releases = merge_releases(
+            [parse_release_spec(spec, args.platforms.split(",")) for spec in specs]
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+
+    token = None
+    if not args.dry_run:
+        token = get_github_token()
+        if not token:
+            print("❌ GitHub token not found in environment variables")
+            print("💡 This script needs a GITHUB_TOKEN environment variable")
+            return False
+        print("✅ GitHub token found")
+
+    scheduler = PipelineScheduler(args.disk_workers, args.network_workers)
+    verify_tasks, feed_tasks = build_pipeline(scheduler, releases, token, args.dry_run, args.repack)
+
+    print(f"\n📋 Running {len(scheduler.tasks)} tasks for {len(releases)} release(s)...")
+    started = time.perf_counter()
+    success = scheduler.run()
+    elapsed = time.perf_counter() - started
+
+    print(f"\n{'=' * 50}")
+    print(f"⏱️  Total: {elapsed:.1f}s "
+          f"(disk busy: {scheduler.busy_time('disk'):.1f}s, "
+          f"network busy: {scheduler.busy_time('network'):.1f}s)")
+
+    if not success:
+        failed = [task.name for task in scheduler.tasks.values() if task.error is not None]
+        print(f"❌ {len(failed)}/{len(scheduler.tasks)} tasks failed or were skipped")
+        return False
+
+    if args.dry_run:
+        print("🎉 All artifacts passed preflight and digest!")
+        return True
+
+    print("🎉 All files uploaded and verified!")
+    print("\n📥 Download Links:")
+    for task in verify_tasks:
+        print(f"   {task.result['download_url']}")
+    print("\n📰 Update Feeds:")
+    for task in feed_tasks:
+        print(f"   {task.result}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Deterministic parallel re-compression of the macOS zip artifacts
+
+electron-builder writes the mac zips with single-threaded deflate and the
+build machine's timestamps, so two builds of the same app never produce the
+same bytes. This rewrites each zip with:
+
+- members sorted by name and every timestamp set to SOURCE_DATE_EPOCH
+  (or 1980-01-01 when unset), with no extra fields
+- Unix permissions and symlinks kept as-is, so the .app bundle still runs
+- every member deflated in 1 MiB chunks across all cores; each chunk is
+  primed with the previous 32 KiB and sync-flushed, so the chunks join into
+  one valid deflate stream and the output doesn't depend on the worker count;
+  members that deflate doesn't shrink are stored instead
+
+Output is byte-reproducible for a given zlib build and compression level.
+
+Usage:
+    python3 repack_mac_zips.py                   # every release/*-mac.zip, in place
+    python3 repack_mac_zips.py --output-dir out release/Professional-Audio-Mixer-1.0.0-arm64-mac.zip
+"""
+
+import argparse
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Configuration
+RELEASE_DIR = "release"
+COMPRESSION_LEVEL = 9
+CHUNK_SIZE = 1024 * 1024
+DICT_SIZE = 32 * 1024
+
+LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+END_OF_CENTRAL_DIR = struct.Struct("<IHHHHIIH")
+ZIP_LIMIT = 0xFFFFFFFF
+
+
+def dos_timestamp():
+    """DOS (time, date) for SOURCE_DATE_EPOCH, or 1980-01-01 00:00 when unset"""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if not epoch:
+        return 0, (1 << 5) | 1
+    t = time.gmtime(max(int(epoch), 315532800))
+    return (
+        (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2),
+        ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    )
+
+
+def _deflate_chunk(data, zdict, last, level):
+    """Raw-deflate one chunk; every chunk but the last ends on a byte boundary"""
+    if zdict:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15, 8,
+                                      zlib.Z_DEFAULT_STRATEGY, zdict)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(
+        zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH
+    )
+
+
+def _submit_chunks(executor, source, infos, level):
+    """Read members in order and queue their chunks for compression"""
+    for info in infos:
+        if info.is_dir():
+            yield info, None, 0, True
+            continue
+
+        with source.open(info) as member:
+            crc = 0
+            zdict = None
+            chunk = member.read(CHUNK_SIZE)
+            while True:
+                next_chunk = member.read(CHUNK_SIZE) if chunk else b""
+                last = not next_chunk
+                crc = zlib.crc32(chunk, crc)
+                future = executor.submit(_deflate_chunk, chunk, zdict, last, level)
+                yield info, future, crc, last
+                if last:
+                    break
+                zdict = chunk[-DICT_SIZE:]
+                chunk = next_chunk
+
+
+def _ordered_results(executor, source, infos, level, window):
+    """Yield compressed chunks in archive order with a bounded number in flight"""
+    pending = deque()
+    for item in _submit_chunks(executor, source, infos, level):
+        pending.append(item)
+        if len(pending) >= window:
+            yield pending.popleft()
+    while pending:
+        yield pending.popleft()
+
+
+def repack_zip(source_path, output_path, level=COMPRESSION_LEVEL, workers=None):
+    """Rewrite source_path as a deterministic zip at output_path; returns member count"""
+    workers = workers or os.cpu_count() or 1
+    dos_time, dos_date = dos_timestamp()
+    central = []
+
+    with zipfile.ZipFile(source_path) as source, \
+            open(output_path, "wb") as out, \
+            ThreadPoolExecutor(max_workers=workers) as executor:
+        infos = sorted(
+            {info.filename: info for info in source.infolist()}.values(),
+            key=lambda info: info.filename
+        )
+
+        header_offset = compressed_size = 0
+        method = zipfile.ZIP_DEFLATED
+        started = False
+        for info, future, crc, last in _ordered_results(
+                executor, source, infos, level, workers * 4):
+            name = info.filename.encode("utf-8")
+            flags = 0 if name.isascii() else 0x800
+
+            if not started:
+                header_offset = out.tell()
+                compressed_size = 0
+                method = zipfile.ZIP_STORED if future is None else zipfile.ZIP_DEFLATED
+                out.write(LOCAL_HEADER.pack(0x04034B50, 20, flags, method, dos_time,
+                                            dos_date, 0, 0, 0, len(name), 0))
+                out.write(name)
+                started = True
+
+            data = future.result() if future is not None else b""
+            out.write(data)
+            compressed_size += len(data)
+            if not last:
+                continue
+
+            size = info.file_size
+            if method == zipfile.ZIP_DEFLATED and compressed_size >= size:
+                # Deflate did not help (already-compressed data), store the member instead
+                out.seek(header_offset + LOCAL_HEADER.size + len(name))
+                out.truncate()
+                with source.open(info) as member:
+                    shutil.copyfileobj(member, out, CHUNK_SIZE)
+                method, compressed_size = zipfile.ZIP_STORED, size
+            if max(size, compressed_size, out.tell()) > ZIP_LIMIT:
+                raise RuntimeError(f"{info.filename}: zip64 archives are not supported")
+
+            # Fill in the method, CRC and sizes now that the member is written
+            end = out.tell()
+            out.seek(header_offset + 8)
+            out.write(struct.pack("<HHHIII", method, dos_time, dos_date,
+                                  crc, compressed_size, size))
+            out.seek(end)
+
+            central.append(CENTRAL_HEADER.pack(
+                0x02014B50, (info.create_system << 8) | 20, 20, flags, method,
+                dos_time, dos_date, crc, compressed_size, size, len(name),
+                0, 0, 0, 0, info.external_attr, header_offset
+            ) + name)
+            started = False
+
+        if len(central) > 0xFFFF:
+            raise RuntimeError("zip64 archives are not supported")
+        central_offset = out.tell()
+        for entry in central:
+            out.write(entry)
+        out.write(END_OF_CENTRAL_DIR.pack(0x06054B50, 0, 0, len(central), len(central),
+                                          out.tell() - central_offset, central_offset, 0))
+
+    return len(central)
+
+
+def repack_file(file_path, output_dir=None, level=COMPRESSION_LEVEL, workers=None, verify=True):
+    """Repack one zip in place (or into output_dir); returns (old_size, new_size, seconds)"""
+    file_path = Path(file_path)
+    target = Path(output_dir) / file_path.name if output_dir else file_path
+    target.parent.mkdir(parents=True, exist_ok=True)
+
+    started = time.perf_counter()
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{file_path.name}.", dir=target.parent)
+    os.close(fd)
+    try:
+        repack_zip(file_path, tmp_path, level, workers)
+        if verify:
+            with zipfile.ZipFile(tmp_path) as repacked:
+                bad = repacked.testzip()
+            if bad is not None:
+                raise RuntimeError(f"CRC check failed for {bad}")
+        old_size = file_path.stat().st_size
+        os.chmod(tmp_path, file_path.stat().st_mode & 0o777)
+        os.replace(tmp_path, target)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return old_size, target.stat().st_size, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deterministically repack macOS zip artifacts")
+    parser.add_argument("files", nargs="*", help=f"zips to repack (default: {RELEASE_DIR}/*-mac.zip)")
+    parser.add_argument("--output-dir", help="write repacked zips here instead of in place")
+    parser.add_argument("--level", type=int, default=COMPRESSION_LEVEL, choices=range(1, 10))
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--no-verify", action="store_true", help="skip the CRC check of the output")
+    args = parser.parse_args()
+
+    print("🗜️  Repacking macOS Release Zips")
+    print("=" * 50)
+
+    files = [Path(f) for f in args.files] or sorted(Path(RELEASE_DIR).glob("*-mac.zip"))
+    if not files:
+        print(f"❌ No mac zips found in {RELEASE_DIR}/")
+        return False
+
+    total_before = total_after = 0
+    success = True
+    for file_path in files:
+        print(f"\n📦 {file_path.name}")
+        try:
+            before, after, elapsed = repack_file(
+                file_path, args.output_dir, args.level, args.workers, not args.no_verify
+            )
+        except (OSError, RuntimeError, zipfile.BadZipFile) as e:
+            print(f"❌ Failed to repack {file_path.name}: {e}")
+            success = False
+            continue
+        total_before += before
+        total_after += after
+        delta = after - before
+        print(f"✅ {before / (1024 * 1024):.1f} MB -> {after / (1024 * 1024):.1f} MB "
+              f"({delta / (1024 * 1024):+.1f} MB, {delta / before * 100:+.1f}%) in {elapsed:.1f}s")
+
+    if total_before:
+        delta = total_after - total_before
+        print(f"\n{'=' * 50}")
+        print(f"📊 Total: {delta / (1024 * 1024):+.1f} MB ({delta / total_before * 100:+.1f}%)")
+    return success
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+electron-updater feed files (latest-mac.yml / latest-linux.yml)
+
+Installed apps poll these few hundred bytes instead of the GitHub releases
+API. The SHA-512 of each artifact is taken from the stream that uploads it
+(see HashingReader) or from the release agent's manifest, so writing a feed
+never reads an artifact again.
+
+Usage:
+    python3 update_feed.py mac      # print latest-mac.yml from release/.release-manifest.json
+"""
+
+import base64
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from release_agent import RELEASE_DIR, lookup_manifest
+
+# Feed file published next to the artifacts for each platform
+FEED_NAMES = {
+    "mac": "latest-mac.yml",
+    "linux": "latest-linux.yml"
+}
+
+
+class HashingReader:
+    """File wrapper that feeds every byte read through the given hashers
+
+    requests streams a body with a read() method and uses len() for the
+    Content-Length header, so wrapping the upload file hashes it in the same
+    pass.
+    """
+
+    def __init__(self, file, size, *hashers):
+        self.file = file
+        self.size = size
+        self.hashers = hashers
+
+    def __len__(self):
+        return self.size
+
+    def read(self, size=-1):
+        data = self.file.read(size)
+        for hasher in self.hashers:
+            hasher.update(data)
+        return data
+
+
+def sha512_base64(hex_digest):
+    """electron-updater expects the SHA-512 base64-encoded, not hex"""
+    return base64.b64encode(bytes.fromhex(hex_digest)).decode("ascii")
+
+
+def release_date(timestamp=None):
+    """ISO 8601 UTC timestamp with milliseconds, as electron-builder writes it"""
+    if timestamp:
+        moment = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    else:
+        moment = datetime.now(timezone.utc)
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.") + \
+        f"{moment.microsecond // 1000:03d}Z"
+
+
+def build_feed(version, artifacts, date):
+    """Render a latest-*.yml feed for artifacts given as dicts with name, size, sha512 (hex)"""
+    lines = [f"version: {version}", "files:"]
+    for artifact in artifacts:
+        lines += [
+            f"  - url: {artifact['name']}",
+            f"    sha512: {sha512_base64(artifact['sha512'])}",
+            f"    size: {artifact['size']}"
+        ]
+    # Older electron-updater versions only read the top-level path and sha512
+    lines += [
+        f"path: {artifacts[0]['name']}",
+        f"sha512: {sha512_base64(artifacts[0]['sha512'])}",
+        f"releaseDate: '{date}'"
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    from release_pipeline import PLATFORM_FILES, get_package_version
+
+    platform = sys.argv[1] if len(sys.argv) > 1 else "mac"
+    if platform not in FEED_NAMES:
+        print(f"❌ Unknown platform: {platform}")
+        return False
+
+    version = get_package_version()
+    artifacts = []
+    for pattern in PLATFORM_FILES[platform]:
+        name = pattern.format(version=version)
+        path = Path(RELEASE_DIR) / name
+        entry = None
+        if path.exists():
+            stat = path.stat()
+            entry = lookup_manifest(name, stat.st_size, stat.st_mtime_ns)
+        if not entry:
+            print(f"❌ {name} has not been prepared, run release_agent.py --once first")
+            return False
+        if not entry["valid"]:
+            print(f"❌ Invalid artifact {name}: {entry['error']}")
+            return False
+        artifacts.append(dict(entry, name=name))
+
+    print(build_feed(version, artifacts, release_date()), end="")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)